@@ -1,9 +1,33 @@
-import gradio as gr
+from __future__ import annotations
+
+import atexit
+import concurrent.futures
+import functools
+import hashlib
 import json
 import os
+import re
 import logging
-from typing import List, Dict
-from llama_stack_client import LlamaStackClient, Agent
+import logging.config
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, List, Dict, Mapping
+
+# orjson ships with gradio; fall back to the stdlib json module if it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# gradio and llama_stack_client are heavy imports; load them only where they are used
+if TYPE_CHECKING:
+    import gradio as gr
+    from llama_stack_client import LlamaStackClient, Agent
 
 
 """
@@ -13,9 +37,24 @@ This application uses Python's built-in logging module for professional logging.
 
 Environment Variables for Logging:
 - LOG_LEVEL: Set logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL). Default: INFO
+- APP_ENV: Set to "dev" to launch Gradio with debug mode and browser tracebacks. Default: prod
 
 Environment Variables for Tools:
 - ENABLE_BUILTIN_TOOLS: Enable builtin tools like websearch/RAG (true/false). Default: false
+- TOOLS_CACHE_TTL: Seconds to cache tools.list() results from Llama Stack. Default: 60
+- CHAT_AGENT_CACHE_ENABLED: Reuse the Agent across ChatTab instances (true/false). Default: true
+- CHAT_CACHE_SIZE: Number of chat responses kept in the per-session LRU cache (0 disables it). Default: 0
+- CHAT_CACHE_TTL: Seconds a cached chat response is served before asking the agent again. Default: 1800
+- MAX_CHAT_HISTORY: Maximum number of messages kept in the chat window (0 disables the cap). Default: 200
+- CHAT_ENHANCE_PROMPT: Wrap user messages with explicit tool-usage instructions (true/false). Default: false
+- CHAT_STREAM: Stream tokens into the chat as they are generated; set to false for providers without SSE. Default: true
+- CHAT_SESSION_MAX_TURNS: Agent turns per session before a fresh agent session bounds the prompt size (0 disables). Default: 0
+- CHAT_DIRECT_LISTING: Answer plain "list pods"/"list namespaces" messages straight from the MCP tool, skipping the LLM (true/false). Default: false
+- STATUS_CACHE_TTL: Seconds to reuse the last system status report. Default: 10
+- STATUS_DEEP_HEALTH: Probe the LLM with a real chat completion in System Status (true/false). Default: false
+- HEALTH_TIMEOUT: Seconds to wait for the System Status probes, which run in parallel. Default: 15
+- MCP_RESULT_TRUNCATE: Maximum characters of an MCP tool result shown in the MCP Test tab. Default: 65536
+- MCP_BATCH_WORKERS: Concurrent calls when MCP Test parameters are a JSON list of argument objects. Default: 8
 - TAVILY_SEARCH_API_KEY: API key for websearch tool (if ENABLE_BUILTIN_TOOLS=true)
 - Other API keys as needed for builtin tools
 
@@ -25,64 +64,165 @@ Examples:
   export ENABLE_BUILTIN_TOOLS=true  # Enable builtin tools (requires API keys)
   
 Log Levels:
-- DEBUG: Detailed information for debugging (tools, responses, etc.)
+- DEBUG: Detailed information for debugging (tools, responses, tracebacks, etc.)
 - INFO: General information about application flow
 - WARNING: Warning messages (tool validation failures, etc.)
-- ERROR: Error messages with full tracebacks
+- ERROR: Error messages (tracebacks are logged at DEBUG)
 - CRITICAL: Critical errors that may cause application failure
 """
 
 
+# Loggers handed out by get_logger
+_APP_LOGGERS = ("chat", "mcp", "system", "init")
+
+
 # Configure logging
 def setup_logging():
-    """Configure logging with different levels and formatters"""
+    """Configure the console handler, formatter and logger levels in one dictConfig call"""
     # Get log level from environment variable, default to INFO
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Configure third-party loggers to reduce noise
-    # Set httpx (HTTP client) to WARNING level to reduce HTTP request logs
-    httpx_logger = logging.getLogger("httpx")
-    httpx_logger.setLevel(logging.WARNING)
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {
+                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                "datefmt": "%Y-%m-%d %H:%M:%S",
+            },
+        },
+        "handlers": {
+            "console": {"class": "logging.StreamHandler", "formatter": "default"},
+        },
+        # LOG_LEVEL applies to the app's own loggers only
+        "loggers": {name: {"level": log_level} for name in _APP_LOGGERS},
+        # Third-party libraries (gradio, uvicorn, httpx, httpcore, llama_stack_client...) only report warnings
+        "root": {"level": "WARNING", "handlers": ["console"]},
+    })
     
-    # Set urllib3 (HTTP library) to WARNING level
-    urllib3_logger = logging.getLogger("urllib3")
-    urllib3_logger.setLevel(logging.WARNING)
-    
-    # Set requests to WARNING level
-    requests_logger = logging.getLogger("requests")
-    requests_logger.setLevel(logging.WARNING)
-    
-    return log_level, formatter
+    return log_level
 
 
 # Initialize logging configuration
-log_level, log_formatter = setup_logging()
+log_level = setup_logging()
 
 
 def get_logger(name: str):
-    """Get a logger with the specified name and proper configuration"""
-    logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, log_level))
+    """Get a logger with the specified name (one of _APP_LOGGERS); records propagate to the root console handler"""
+    return logging.getLogger(name)
+
+
+class _ToolsCache:
+    """In-memory TTL cache for client.tools.list() results, keyed by toolgroup_id"""
     
-    # Clear any existing handlers
-    logger.handlers.clear()
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, client: LlamaStackClient, toolgroup_id: str = None) -> list:
+        """Return the cached tool list, fetching it from Llama Stack if missing or expired"""
+        key = (id(client), toolgroup_id)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        
+        if toolgroup_id is None:
+            tools = client.tools.list()
+        else:
+            tools = client.tools.list(toolgroup_id=toolgroup_id)
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic(), tools)
+        return tools
+    
+    def invalidate(self):
+        """Drop all cached entries so the next get() refetches from Llama Stack"""
+        with self._lock:
+            self._entries.clear()
+
+
+tools_cache = _ToolsCache(ttl=float(os.getenv("TOOLS_CACHE_TTL", "60")))
+
+# Separator line used in log banners and status reports
+SEP = "=" * 60
+
+# System status report caching and LLM probe depth
+STATUS_CACHE_TTL = float(os.getenv("STATUS_CACHE_TTL", "10"))
+STATUS_DEEP_HEALTH = os.getenv("STATUS_DEEP_HEALTH", "false").lower() == "true"
+HEALTH_TIMEOUT = float(os.getenv("HEALTH_TIMEOUT", "15"))
+
+# Maximum number of characters of an MCP tool result shown in the MCP Test tab
+MCP_RESULT_TRUNCATE = int(os.getenv("MCP_RESULT_TRUNCATE", "65536"))
+
+# Concurrent calls when the MCP Test parameters are a JSON list of argument objects
+MCP_BATCH_WORKERS = int(os.getenv("MCP_BATCH_WORKERS", "8"))
+
+# Agent per (client, model, toolgroups, sampling params), shared by ChatTab instances
+CHAT_AGENT_CACHE_ENABLED = os.getenv("CHAT_AGENT_CACHE_ENABLED", "true").lower() == "true"
+_AGENT_CACHE = {}
+
+# Maximum number of prompt -> response entries kept by each ChatTab (0, the default, disables the cache:
+# a cached answer skips the agent turn, so tools don't run and the session never records the exchange)
+# and how long an entry is served before the cluster is queried again
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "0"))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "1800"))
+
+# Maximum number of messages kept in the chat window per session
+MAX_CHAT_HISTORY = int(os.getenv("MAX_CHAT_HISTORY", "200"))
+
+# Wrap each user message with explicit tool-usage instructions (model_prompt already covers this)
+CHAT_ENHANCE_PROMPT = os.getenv("CHAT_ENHANCE_PROMPT", "false").lower() == "true"
+CHAT_STREAM = os.getenv("CHAT_STREAM", "true").lower() == "true"
+# Seconds between streamed chat updates; the final content is always sent
+CHAT_STREAM_FLUSH_INTERVAL = 0.05
+# A sentence end flushes early, but never sooner than this after the previous update
+CHAT_STREAM_SENTENCE_FLUSH_INTERVAL = 0.02
+# Words ending in "." that don't end a sentence
+_ABBREVIATIONS = frozenset({"e.g", "i.e", "etc", "vs", "approx", "mr", "mrs", "ms", "dr"})
+
+# Agent turns per agent session before a fresh session is started (0 keeps sessions forever)
+CHAT_SESSION_MAX_TURNS = int(os.getenv("CHAT_SESSION_MAX_TURNS", "0"))
+# Identical tool responses in a row after which a turn is treated as a tool loop and aborted
+CHAT_TOOL_LOOP_LIMIT = 3
+
+# Plain listing requests answered by calling the MCP tool directly instead of running an agent turn.
+# Off by default: the exchange is not recorded in the agent session, so follow-ups lack its context.
+CHAT_DIRECT_LISTING = os.getenv("CHAT_DIRECT_LISTING", "false").lower() == "true"
+_DIRECT_LISTING_RE = re.compile(r"^\s*(?:list|show|get)\s+(?:all\s+)?(pods|namespaces)\s*[.!?]?\s*$", re.IGNORECASE)
+_DIRECT_LISTING_TOOLS = MappingProxyType({"pods": "pods_list", "namespaces": "namespaces_list"})
+
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """Connection, model and launch settings resolved once from the environment
     
-    # Prevent propagation to root logger to avoid duplicates
-    logger.propagate = False
+    Tuning knobs (CHAT_*, STATUS_*, MCP_*, HEALTH_TIMEOUT...) stay module constants read at import.
+    """
     
-    # Create console handler only
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level))
-    console_handler.setFormatter(log_formatter)
-    logger.addHandler(console_handler)
+    llama_stack_url: str
+    model: str
+    enable_builtin_tools: bool
+    sampling_params: Mapping[str, Any]
+    app_env: str
     
-    return logger
+    @classmethod
+    def from_env(cls) -> AppConfig:
+        """Build the configuration from a single snapshot of the environment"""
+        env = dict(os.environ)
+        return cls(
+            llama_stack_url=env.get("LLAMA_STACK_URL", "http://localhost:8321"),
+            model=env.get("DEFAULT_LLM_MODEL", "llama-3-2-3b"),
+            enable_builtin_tools=env.get("ENABLE_BUILTIN_TOOLS", "false").lower() == "true",
+            # Read-only so it can be shared across tabs without copying
+            sampling_params=MappingProxyType({
+                "temperature": 0.7,
+                "max_tokens": 4096,
+                "strategy": {"type": "greedy"}  # Added strategy like in the working example
+            }),
+            app_env=env.get("APP_ENV", "prod"),
+        )
 
 
 # # More specific model prompt that emphasizes using tools correctly
@@ -130,6 +270,65 @@ IMPORTANT RULES:
 
 Remember: You are connected to a real cluster. Use the tools to get real information."""
 
+
+def _tool_name(tool) -> str:
+    """Resolve a display name for a tool from its name, identifier or string form"""
+    return getattr(tool, "name", None) or getattr(tool, "identifier", None) or str(tool)
+
+
+def _extract_text(item) -> str:
+    """Return the text of a content item, falling back to its string form"""
+    text = getattr(item, "text", None)
+    return text if text is not None else str(item)
+
+
+def _normalize_prompt(message: str) -> str:
+    """Normalize a chat message so case, spacing and trailing punctuation variants share a cache key"""
+    return " ".join(message.lower().split()).rstrip("?!. ")
+
+
+def _is_sentence_end(text: str) -> bool:
+    """True when streamed text ends a sentence, ignoring decimals like "1." and abbreviations like "e.g." """
+    if not text.endswith((".", "!", "?")):
+        return False
+    if text[-1] != ".":
+        return True
+    words = text[:-1].split()
+    word = words[-1].lstrip("(\"'").lower() if words else ""
+    return not (word[-1:].isdigit() or word in _ABBREVIATIONS)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON with orjson when available (orjson.JSONDecodeError subclasses json.JSONDecodeError)"""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _json_dumps_pretty(data: Any) -> str:
+    """Pretty-print JSON with a 2-space indent, stringifying values JSON can't represent"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, default=str, ensure_ascii=False)
+
+
+def _include_toolgroup(chat_tab) -> bool:
+    """Default policy: include the toolgroup"""
+    return True
+
+
+# Whether a toolgroup is passed to the Agent, keyed by the toolgroup ID prefix before "::"
+_TOOLGROUP_POLICY = {
+    # Always include MCP tools
+    "mcp": _include_toolgroup,
+    # Only include builtin tools if explicitly enabled (they require API keys)
+    "builtin": lambda chat_tab: chat_tab.enable_builtin_tools,
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _format_prompt(tool_groups: str) -> str:
+    """Render model_prompt for a toolgroup list, memoized per distinct list"""
+    return model_prompt.format(tool_groups=tool_groups)
+
 # # Example queries to test different capabilities
 # example_queries = [
 #     "List all pods in the intelligent-cd namespace",
@@ -142,46 +341,60 @@ Remember: You are connected to a real cluster. Use the tools to get real informa
 class ChatTab:
     """Handles chat functionality with Llama Stack LLM"""
     
+    __slots__ = (
+        "client", "model", "sampling_params", "enable_builtin_tools", "logger",
+        "_response_cache", "_cache_lock", "_turn_locks", "_session_turns", "_ended_sessions", "_session_lock", "available_tools", "tools_array", "_tools_csv", "_enhanced_suffix", "agent",
+    )
+    
     def __init__(self, client: LlamaStackClient, model: str, sampling_params: dict, enable_builtin_tools: bool = False):
         self.client = client
         self.model = model
         self.sampling_params = sampling_params
         self.enable_builtin_tools = enable_builtin_tools
         self.logger = get_logger("chat")
+        # LRU cache of (session, normalized prompt) hash -> (timestamp, response content)
+        self._response_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Per agent session locks, held while a turn is running to drop overlapping submits
+        self._turn_locks = {}
+        # Agent turns run per agent session, to start a fresh session once CHAT_SESSION_MAX_TURNS is reached
+        self._session_turns = {}
+        # Sessions ended while a turn was streaming, deleted by chat_completion once the turn finishes
+        self._ended_sessions = set()
+        self._session_lock = threading.Lock()
         
         # Initialize available tools once during initialization
         # - available_tools => For the model prompt
         # - tools_array => For the agent configuration
         self.available_tools, self.tools_array = self._get_available_tools()
-        # Initialize agent and session for the entire chat
-        self.agent, self.session_id = self._initialize_agent()
+        self._tools_csv = ", ".join(self.tools_array)
+        # Static tail of the enhanced turn message, built once since tools_array doesn't change
+        self._enhanced_suffix = (
+            "IMPORTANT: You MUST execute MCP tools to get real data. Do not write Python code or generate fake data.\n\n"
+            f"Available tools: {self._tools_csv}\n\n"
+            "Execute the appropriate tools and show me the real results."
+        )
+        # Initialize the agent; each browser session gets its own agent session via _create_session
+        self.agent = self._initialize_agent()
     
     def _get_available_tools(self) -> tuple[str, list]:
         """Get available tools and convert to array format once during initialization"""
-        tools = self.client.tools.list()
+        tools = tools_cache.get(self.client)
         
-        tool_groups = list(set(tool.toolgroup_id for tool in tools))
+        tool_groups = list(dict.fromkeys(tool.toolgroup_id for tool in tools))
         self.logger.info(f"Found {len(tool_groups)} toolgroups: {tool_groups}")
         
         # The Agent expects toolgroup IDs, not individual tool names
         # Filter tools based on configuration
         filtered_tool_groups = []
         for toolgroup in tool_groups:
-            if toolgroup.startswith('mcp::'):
-                # Always include MCP tools
-                filtered_tool_groups.append(toolgroup)
-                self.logger.info(f"✅ Including MCP toolgroup: {toolgroup}")
-            elif toolgroup.startswith('builtin::'):
-                # Only include builtin tools if explicitly enabled
-                if self.enable_builtin_tools:
-                    filtered_tool_groups.append(toolgroup)
-                    self.logger.info(f"✅ Including builtin toolgroup: {toolgroup}")
-                else:
-                    self.logger.warning(f"⚠️ Skipping builtin toolgroup (requires API keys): {toolgroup}")
-            else:
-                # Include other toolgroups
+            prefix = toolgroup.split("::", 1)[0]
+            # Toolgroups with an unknown prefix are included
+            if _TOOLGROUP_POLICY.get(prefix, _include_toolgroup)(self):
                 filtered_tool_groups.append(toolgroup)
                 self.logger.info(f"✅ Including toolgroup: {toolgroup}")
+            else:
+                self.logger.warning(f"⚠️ Skipping toolgroup disabled by configuration: {toolgroup}")
         
         if filtered_tool_groups:
             tools_string = ", ".join(filtered_tool_groups)
@@ -195,17 +408,29 @@ class ChatTab:
         self.logger.info(f"Final tools_array (filtered toolgroup IDs): {tools_array}")
         return tools_string, tools_array
     
-    def _initialize_agent(self) -> tuple[Agent, str]:
-        """Initialize agent and session that will be reused for the entire chat"""
-        formatted_prompt = model_prompt.format(tool_groups=self.available_tools)
+    def _initialize_agent(self) -> Agent:
+        """Initialize the agent that will be reused for the entire chat"""
+        # Reuse an Agent already built for the same client, model, tools and sampling params
+        cache_key = (
+            id(self.client),
+            self.model,
+            tuple(sorted(self.tools_array)),
+            json.dumps(self.sampling_params, sort_keys=True),
+        )
+        if CHAT_AGENT_CACHE_ENABLED and cache_key in _AGENT_CACHE:
+            self.logger.info("♻️ Reusing cached Agent")
+            return _AGENT_CACHE[cache_key]
+        
+        formatted_prompt = _format_prompt(self.available_tools)
 
         # Debug: Log all values being passed to the Agent
-        self.logger.info("=" * 60)
+        self.logger.info(SEP)
         self.logger.info("CREATING AGENT")
-        self.logger.info("=" * 60)
+        self.logger.info(SEP)
         self.logger.info(f"Client: {type(self.client).__name__} (base_url: {getattr(self.client, 'base_url', 'N/A')})")
         self.logger.info(f"Model: {self.model}")
-        self.logger.info(f"Instructions: {formatted_prompt[:200]}{'...' if len(formatted_prompt) > 200 else ''}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Instructions: {formatted_prompt[:200]}{'...' if len(formatted_prompt) > 200 else ''}")
         self.logger.info(f"Tools: {self.tools_array}")
         self.logger.info(f"Sampling params: {self.sampling_params}")
         
@@ -214,27 +439,26 @@ class ChatTab:
         valid_tools = []
         all_available_tools = []
         
+        # Fetch all tools once and group them by toolgroup instead of one request per toolgroup
+        tools_by_group = {}
+        for tool in tools_cache.get(self.client):
+            tools_by_group.setdefault(tool.toolgroup_id, []).append(tool)
+        
         for tool_name in self.tools_array:
-            self.logger.debug(f"Checking tool: {tool_name}")
-            try:
-                # Try to get tools for this toolgroup
-                tools_for_group = self.client.tools.list(toolgroup_id=tool_name)
-                self.logger.info(f"✅ Found {len(tools_for_group)} tools for {tool_name}")
-                
-                # Log individual tool names for debugging
-                for tool in tools_for_group:
-                    if hasattr(tool, 'name'):
-                        tool_name_str = tool.name
-                    elif hasattr(tool, 'identifier'):
-                        tool_name_str = tool.identifier
-                    else:
-                        tool_name_str = str(tool)
-                    all_available_tools.append(tool_name_str)
-                    self.logger.debug(f"  - Tool: {tool_name_str}")
-                
-                valid_tools.append(tool_name)
-            except Exception as e:
-                self.logger.warning(f"❌ Tool validation failed for {tool_name}: {str(e)}")
+            self.logger.debug("Checking tool: %s", tool_name)
+            tools_for_group = tools_by_group.get(tool_name, [])
+            if not tools_for_group:
+                self.logger.warning(f"❌ Tool validation failed for {tool_name}: no tools found")
+                continue
+            self.logger.info(f"✅ Found {len(tools_for_group)} tools for {tool_name}")
+            
+            # Log individual tool names for debugging
+            for tool in tools_for_group:
+                tool_name_str = _tool_name(tool)
+                all_available_tools.append(tool_name_str)
+                self.logger.debug("  - Tool: %s", tool_name_str)
+            
+            valid_tools.append(tool_name)
         
         self.logger.info(f"Valid toolgroups for Agent: {valid_tools}")
         self.logger.info(f"All available individual tools: {all_available_tools}")
@@ -250,6 +474,8 @@ class ChatTab:
         self.logger.info(f"Creating Agent with model: {self.model}")
         self.logger.info(f"Tools available: {tools_for_agent}")
         
+        from llama_stack_client import Agent
+        
         # Try different tool configuration approaches
         try:
             agent = Agent(
@@ -275,10 +501,17 @@ class ChatTab:
             )
             self.logger.info("✅ Agent created successfully without tool_config")
         
-        # Create session for the agent
+        if CHAT_AGENT_CACHE_ENABLED:
+            _AGENT_CACHE[cache_key] = agent
+        
+        self.logger.info(SEP)
+        return agent
+    
+    def _create_session(self, agent: Agent) -> str:
+        """Create a new session on the agent and return its ID"""
         self.logger.info("Creating session with name: OCP_Chat_Session")
         session = agent.create_session(session_name="OCP_Chat_Session")
-        self.logger.debug(f"Session created: {session}")
+        self.logger.debug("Session created: %s", session)
         
         # Handle both object with .id attribute and direct string return
         if hasattr(session, 'id'):
@@ -287,81 +520,262 @@ class ChatTab:
         else:
             session_id = str(session)
             self.logger.info(f"Session ID from string conversion: {session_id}")
+        return session_id
+    
+    def chat_completion(self, message: str, chat_history: List[Dict[str, str]], session_id: str | None = None, use_cache: bool = True):
+        """Handle chat with LLM using Agent → Session → Turn structure, streaming partial responses
+        
+        chat_history and session_id are per browser session gr.State values; yields
+        (chatbot, state, session, textbox) updates. Each browser session gets its own
+        agent session so concurrent users don't queue behind one another.
+        """
+        if session_id is None:
+            session_id = self._create_session(self.agent)
         
-        self.logger.info("=" * 60)
-        return agent, session_id
+        # An agent session handles one turn at a time; ignore submits while a turn is in flight
+        turn_lock = self._turn_locks.setdefault(session_id, threading.Lock())
+        if not turn_lock.acquire(blocking=False):
+            import gradio as gr
+            
+            gr.Warning("⏳ Still answering the previous message, please wait...")
+            yield chat_history, chat_history, session_id, message
+            return
+        
+        try:
+            # The agent resends the whole session to the model every turn; cap its growth
+            if CHAT_SESSION_MAX_TURNS and self._session_turns.get(session_id, 0) >= CHAT_SESSION_MAX_TURNS:
+                session_id = self._rotate_session(session_id, turn_lock)
+            for history in self._chat_turn(message, chat_history, session_id, use_cache):
+                yield history, history, session_id, ""
+        finally:
+            with self._session_lock:
+                turn_lock.release()
+                ended = session_id in self._ended_sessions
+                self._ended_sessions.discard(session_id)
+            if ended:
+                self._session_turns.pop(session_id, None)
+                self._delete_session(session_id)
+    
+    def _rotate_session(self, session_id: str, turn_lock: threading.Lock) -> str:
+        """Replace a session that reached CHAT_SESSION_MAX_TURNS with a fresh agent session
+        
+        The held turn_lock moves to the new session so its turns are guarded and counted.
+        """
+        import gradio as gr
+        
+        self.logger.info("Session %s reached %d turns, starting a new agent session", session_id, CHAT_SESSION_MAX_TURNS)
+        self._session_turns.pop(session_id, None)
+        self._turn_locks.pop(session_id, None)
+        self._delete_session(session_id)
+        gr.Info(f"🔄 Started a fresh conversation context after {CHAT_SESSION_MAX_TURNS} turns; earlier messages are no longer sent to the model.")
+        new_session_id = self._create_session(self.agent)
+        self._turn_locks[new_session_id] = turn_lock
+        return new_session_id
+    
+    def end_session(self, session_id: str | None) -> None:
+        """Forget a browser session's agent session (gr.State delete callback and chat clear)"""
+        if session_id is None:
+            return
+        self._session_turns.pop(session_id, None)
+        turn_lock = self._turn_locks.pop(session_id, None)
+        with self._session_lock:
+            if turn_lock is not None and turn_lock.locked():
+                # A turn is still streaming on it; chat_completion deletes it once the turn finishes
+                self.logger.debug("Session %s still has a turn in flight, deleting it afterwards", session_id)
+                self._ended_sessions.add(session_id)
+                return
+        self._delete_session(session_id)
     
-    def chat_completion(self, message: str, chat_history: List[Dict[str, str]]) -> tuple:
-        """Handle chat with LLM using Agent → Session → Turn structure"""
-        # Add user message to history
+    def clear_chat(self, session_id: str | None) -> tuple[list, None]:
+        """Reset the chat state and session when the Chatbot clear button is pressed"""
+        self.end_session(session_id)
+        return [], None
+    
+    def _delete_session(self, session_id: str) -> None:
+        """Delete an agent session on the Llama Stack server"""
+        try:
+            self.client.agents.session.delete(session_id=session_id, agent_id=self.agent.agent_id)
+            self.logger.info("Deleted agent session %s", session_id)
+        except Exception as e:
+            self.logger.warning(f"Could not delete agent session {session_id}: {str(e)}")
+    
+    def _chat_turn(self, message: str, chat_history: List[Dict[str, str]], session_id: str, use_cache: bool):
+        """Append the user message and stream the assistant reply into chat_history"""
+        # Add user message and an empty assistant message that is filled as tokens arrive
         chat_history.append({"role": "user", "content": message})
+        chat_history.append({"role": "assistant", "content": ""})
+        
+        # Keep only the most recent messages (plus a leading system message) to bound memory and DOM size;
+        # 0 disables the cap, and the new user/assistant pair is always kept
+        if MAX_CHAT_HISTORY > 0 and len(chat_history) > MAX_CHAT_HISTORY:
+            keep_first = int(chat_history[0].get("role") == "system")
+            limit = max(MAX_CHAT_HISTORY, 2 + keep_first)
+            del chat_history[keep_first:len(chat_history) - limit + keep_first]
+        
+        # Simple listings are fully answered by the MCP tool output, no LLM round trip needed
+        direct = self._direct_listing(message) if CHAT_DIRECT_LISTING else None
+        if direct is not None:
+            chat_history[-1]["content"] = direct
+            yield chat_history
+            return
+        
+        # Stream LLM response using Agent API
+        for content in self._execute_agent_turn(message, session_id, use_cache=use_cache):
+            chat_history[-1]["content"] = content
+            # Same list goes to the Chatbot (display) and to the session State (server-side history)
+            yield chat_history
+    
+    def _direct_listing(self, message: str) -> str | None:
+        """Answer a plain pods/namespaces listing request from the MCP tool, or None to use the agent"""
+        match = _DIRECT_LISTING_RE.match(message)
+        if match is None:
+            return None
+        
+        resource = match.group(1).lower()
+        tool_name = _DIRECT_LISTING_TOOLS[resource]
+        # Only call tools that belong to the toolgroups this agent was configured with
+        if not any(
+            _tool_name(tool) == tool_name and tool.toolgroup_id in self.tools_array
+            for tool in tools_cache.get(self.client)
+        ):
+            return None
         
-        # Get LLM response using Agent API
-        result = self._execute_agent_turn(message)
+        try:
+            result = self.client.tool_runtime.invoke_tool(tool_name=tool_name, kwargs={})
+        except Exception as e:
+            self.logger.warning(f"Direct {tool_name} call failed, falling back to the agent: {str(e)}")
+            return None
+        if getattr(result, 'error_message', None) or not getattr(result, 'content', None):
+            return None
+        
+        self.logger.info("⚡ Answered '%s' directly with %s (LLM call skipped)", message, tool_name)
+        if isinstance(result.content, list):
+            text = '\n'.join(_extract_text(item) for item in result.content)
+        else:
+            text = str(result.content)
+        if len(text) > MCP_RESULT_TRUNCATE:
+            omitted = len(text) - MCP_RESULT_TRUNCATE
+            text = f"{text[:MCP_RESULT_TRUNCATE]}\n... [truncated {omitted} characters]"
+        return f"Here are the {resource} reported by `{tool_name}`:\n\n```\n{text}\n```"
+    
+    def _execute_agent_turn(self, message: str, session_id: str, use_cache: bool = True):
+        """Execute a single streaming turn, yielding the accumulated response content"""
+        use_cache = use_cache and CHAT_CACHE_SIZE > 0
+        cache_key = hashlib.sha256(f"{self.model}|{session_id}|{_normalize_prompt(message)}".encode()).hexdigest()
+        if use_cache:
+            cached = None
+            with self._cache_lock:
+                entry = self._response_cache.get(cache_key)
+                if entry is not None:
+                    if time.monotonic() - entry[0] < CHAT_CACHE_TTL:
+                        self._response_cache.move_to_end(cache_key)
+                        cached = entry[1]
+                    else:
+                        del self._response_cache[cache_key]
+            if cached is not None:
+                self.logger.info("💾 Response cache hit, skipping agent turn (tokens saved)")
+                yield cached
+                return
         
-        # Add assistant response to history
-        chat_history.append({"role": "assistant", "content": result})
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         
-        return chat_history, ""
-    
-    def _execute_agent_turn(self, message: str) -> str:
-        """Execute a single turn using the persistent agent and session"""
         # Debug: Log all values being passed to create_turn
-        self.logger.debug("=" * 60)
-        self.logger.debug("EXECUTING AGENT TURN")
-        self.logger.debug("=" * 60)
-        self.logger.debug(f"Agent: {type(self.agent).__name__}")
-        self.logger.debug(f"Messages: [{{'role': 'user', 'content': '{message[:100]}{'...' if len(message) > 100 else ''}'}}]")
-        self.logger.debug(f"Session ID: {self.session_id}")
-        self.logger.debug(f"Stream: False")
+        if debug_enabled:
+            self.logger.debug(SEP)
+            self.logger.debug("EXECUTING AGENT TURN")
+            self.logger.debug(SEP)
+            self.logger.debug(f"Agent: {type(self.agent).__name__}")
+            self.logger.debug(f"Messages: [{{'role': 'user', 'content': '{message[:100]}{'...' if len(message) > 100 else ''}'}}]")
+            self.logger.debug(f"Session ID: {session_id}")
+            self.logger.debug("Stream: True")
         
         # Create turn with user message using the persistent agent and session
         self.logger.debug("About to call agent.create_turn...")
-        self.logger.info(f"Available tools for this turn: {self.tools_array}")
+        self.logger.debug("Available tools for this turn: %s", self.tools_array)
         
         try:
-            # Try to force tool usage by being more explicit
-            enhanced_message = f"""User request: {message}
-
-IMPORTANT: You MUST execute MCP tools to get real data. Do not write Python code or generate fake data.
-
-Available tools: {', '.join(self.tools_array)}
-
-Execute the appropriate tools and show me the real results."""
+            if CHAT_ENHANCE_PROMPT:
+                # Try to force tool usage by being more explicit
+                turn_message = f"User request: {message}\n\n{self._enhanced_suffix}"
+            else:
+                # model_prompt already instructs the agent to execute tools
+                turn_message = message
             
-            response = self.agent.create_turn(
+            stream = self.agent.create_turn(
                 messages=[
                     {
                         "role": "user",
-                        "content": enhanced_message
+                        "content": turn_message
                     }
                 ],
-                session_id=self.session_id,
-                stream=False,  # No streaming for chat interface
+                session_id=session_id,
+                stream=CHAT_STREAM,  # Stream tokens to the chat interface as they are generated
             )
+            
+            # Accumulate text deltas and keep the completed Turn for logging and the final content
+            content = ""
+            response = None
+            aborted = False
+            if not CHAT_STREAM:
+                # Non-streaming providers return the completed Turn directly
+                response = stream
+            else:
+                # Coalesce deltas into one update per flush interval, or earlier at a sentence end
+                last_flush = time.monotonic()
+                last_tool_response, repeats = None, 0
+                for chunk in stream:
+                    payload = chunk.event.payload
+                    if payload.event_type == "step_progress" and getattr(payload.delta, 'type', None) == "text":
+                        content += payload.delta.text
+                        elapsed = time.monotonic() - last_flush
+                        if elapsed >= CHAT_STREAM_FLUSH_INTERVAL or (elapsed >= CHAT_STREAM_SENTENCE_FLUSH_INTERVAL and _is_sentence_end(content)):
+                            last_flush = time.monotonic()
+                            yield content
+                    elif payload.event_type == "step_complete" and getattr(payload, 'step_type', None) == "tool_execution":
+                        # A tool failing the same way over and over only grows the session; stop the turn.
+                        # Calls only repeat when the arguments match too, not e.g. pods_list on several namespaces
+                        arguments = {call.call_id: call.arguments for call in getattr(payload.step_details, 'tool_calls', None) or []}
+                        for tool_response in getattr(payload.step_details, 'tool_responses', None) or []:
+                            call_arguments = json.dumps(arguments.get(tool_response.call_id), sort_keys=True, default=str)
+                            signature = (tool_response.tool_name, call_arguments, str(tool_response.content))
+                            repeats = repeats + 1 if signature == last_tool_response else 1
+                            last_tool_response = signature
+                        if repeats >= CHAT_TOOL_LOOP_LIMIT:
+                            self.logger.warning("Tool %s returned the same response %d times in a row, aborting the turn", last_tool_response[0], repeats)
+                            content += f"\n\n⚠️ Stopped: `{last_tool_response[0]}` kept returning the same result. Try rephrasing the request."
+                            if hasattr(stream, 'close'):
+                                stream.close()  # Drop the HTTP stream so the server stops the turn
+                            aborted = True
+                            break
+                    elif payload.event_type == "turn_complete":
+                        response = payload.turn
             self.logger.debug("agent.create_turn completed successfully")
+            self._session_turns[session_id] = self._session_turns.get(session_id, 0) + 1
         except Exception as e:
             self.logger.error(f"Error in agent.create_turn: {str(e)}")
             self.logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Traceback: %s", traceback.format_exc())
             raise e
         
         # Debug: Log response details
-        self.logger.debug("Response received:")
-        self.logger.debug(f"Response type: {type(response).__name__}")
-        self.logger.debug(f"Response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}")
-        self.logger.debug(f"Has output_message: {hasattr(response, 'output_message')}")
+        if debug_enabled:
+            self.logger.debug("Response received:")
+            self.logger.debug(f"Response type: {type(response).__name__}")
+            self.logger.debug(f"Response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}")
+            self.logger.debug(f"Has output_message: {hasattr(response, 'output_message')}")
         
         # Check if the turn has steps (tool executions)
         if hasattr(response, 'steps') and response.steps:
-            self.logger.info(f"Turn has {len(response.steps)} steps (tool executions)")
-            for i, step in enumerate(response.steps):
-                self.logger.info(f"Step {i+1}: {step}")
-        else:
+            self.logger.info("Turn has %d steps (tool executions)", len(response.steps))
+            # Step reprs embed full tool responses; only dump them when DEBUG is on
+            if debug_enabled:
+                for i, step in enumerate(response.steps):
+                    self.logger.debug("Step %d: %s", i + 1, step)
+        elif not aborted:
             self.logger.warning("⚠️ Turn has no steps - tools were not executed!")
         
-        if hasattr(response, 'output_message'):
+        if debug_enabled and hasattr(response, 'output_message'):
             self.logger.debug(f"Output message type: {type(response.output_message).__name__}")
             self.logger.debug(f"Output message attributes: {[attr for attr in dir(response.output_message) if not attr.startswith('_')]}")
             self.logger.debug(f"Has content: {hasattr(response.output_message, 'content')}")
@@ -369,69 +783,112 @@ Execute the appropriate tools and show me the real results."""
                 self.logger.debug(f"Output message content: {response.output_message.content}")
         
         # Extract response content from the turn
-        # The response is a Turn object, extract the output message content
+        # The completed Turn's output message is authoritative over the streamed deltas
         if hasattr(response, 'output_message') and hasattr(response.output_message, 'content'):
             content = response.output_message.content
-            self.logger.debug(f"Extracted content length: {len(content)}")
-            self.logger.debug("=" * 60)
-            return content
-        else:
+            self.logger.debug("Extracted content length: %d", len(content))
+        elif not content:
             # Fallback to string representation
-            fallback_content = str(response)
-            self.logger.debug(f"Fallback content length: {len(fallback_content)}")
-            self.logger.debug("=" * 60)
-            return fallback_content
+            content = str(response)
+            self.logger.debug("Fallback content length: %d", len(content))
+        if debug_enabled:
+            self.logger.debug(SEP)
+        
+        # Tool results are live cluster state, and a turn without steps never reached the tools
+        steps = getattr(response, 'steps', None) or []
+        if use_cache and steps and not any(getattr(step, 'step_type', None) == "tool_execution" for step in steps):
+            with self._cache_lock:
+                self._response_cache[cache_key] = (time.monotonic(), content)
+                if len(self._response_cache) > CHAT_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+        
+        yield content
     
 
 class MCPTestTab:
     """Handles MCP testing functionality with Llama Stack"""
     
+    __slots__ = ("client", "logger", "_index", "_index_source", "_toolgroups")
+    
     def __init__(self, client: LlamaStackClient):
         self.client = client
         self.logger = get_logger("mcp")
+        # Toolgroup -> method names, rebuilt whenever the cached tool list changes
+        self._index = None
+        self._index_source = None
+        self._toolgroups = ()
     
-    def list_toolgroups(self) -> gr.update:
+    def _ensure_index(self) -> dict:
+        """Build the toolgroup → method names index from the cached tool list"""
+        tools = tools_cache.get(self.client)
+        if self._index is not None and tools is self._index_source:
+            return self._index
+        
+        index = {}
+        for tool in tools:
+            toolgroup_id = getattr(tool, 'toolgroup_id', None)
+            if toolgroup_id is None:
+                continue
+            # A tool may expose individual methods or be a direct tool itself
+            for individual_tool in getattr(tool, 'tools', None) or [tool]:
+                index.setdefault(toolgroup_id, []).append(_tool_name(individual_tool))
+        
+        # Tuples so every dropdown update for the same tool list reuses the same objects
+        self._index = {toolgroup_id: tuple(methods) for toolgroup_id, methods in index.items()}
+        self._index_source = tools
+        self._toolgroups = tuple(self._index)
+        return self._index
+    
+    def invalidate(self):
+        """Drop the cached tool list and toolgroup index so the next lookup refetches them"""
+        tools_cache.invalidate()
+        self._index = None
+        self._index_source = None
+    
+    def initial_toolgroups(self) -> tuple:
+        """Toolgroup IDs for the dropdown at page build, or () if Llama Stack can't be reached"""
+        try:
+            self._ensure_index()
+        except Exception as e:
+            self.logger.warning(f"Could not preload toolgroups: {str(e)}")
+        return self._toolgroups
+    
+    def list_toolgroups(self, force_refresh: bool = False) -> gr.update:
         """List available MCP toolgroups through Llama Stack"""
+        import gradio as gr
+        
         self.logger.debug("Attempting to list MCP toolgroups through Llama Stack...")
         
-        # Use the shared client to get tools (which contain toolgroups)
-        tools = self.client.tools.list()
+        if force_refresh:
+            self.invalidate()
         
-        # Extract unique toolgroup IDs from tools
-        toolgroups = list(set(tool.toolgroup_id for tool in tools))
-        self.logger.info(f"Found {len(toolgroups)} toolgroups: {toolgroups}")
+        # Toolgroup IDs are the index keys, in the order Llama Stack returned them
+        self._ensure_index()
+        toolgroups = self._toolgroups
+        self.logger.info("Found %d toolgroups: %s", len(toolgroups), toolgroups)
         
         return gr.update(choices=toolgroups, value=None)
     
+    def refresh_toolgroups(self) -> gr.update:
+        """List toolgroups after dropping all cached tool data (ToolGroups refresh button)"""
+        return self.list_toolgroups(force_refresh=True)
+    
     def get_toolgroup_methods(self, toolgroup_name: str) -> tuple[str, gr.update]:
         """Get methods for a specific toolgroup through Llama Stack"""
+        import gradio as gr
+        
         if not toolgroup_name:
             return (
                 "❌ Please select a toolgroup first",
                 gr.update(choices=[], value=None)
             )
         
-        self.logger.debug(f"Getting methods for toolgroup: {toolgroup_name}")
+        self.logger.debug("Getting methods for toolgroup: %s", toolgroup_name)
         
-        # Use the shared client to get tools for the specific toolgroup
-        tools = self.client.tools.list()
+        # Look up the methods in the precomputed toolgroup index
+        methods = self._ensure_index().get(toolgroup_name, ())
         
-        # Filter tools by toolgroup and extract individual tools
-        methods = []
-        for tool in tools:
-            if hasattr(tool, 'toolgroup_id') and tool.toolgroup_id == toolgroup_name:
-                # Check if this tool has individual tools/methods
-                if hasattr(tool, 'tools') and tool.tools:
-                    # Tool contains individual methods
-                    for individual_tool in tool.tools:
-                        method_name = getattr(individual_tool, 'name', getattr(individual_tool, 'identifier', 'Unknown'))
-                        methods.append(method_name)
-                else:
-                    # This is a direct tool
-                    method_name = getattr(tool, 'name', getattr(tool, 'identifier', 'Unknown'))
-                    methods.append(method_name)
-        
-        self.logger.info(f"Found {len(methods)} methods: {methods}")
+        self.logger.info("Found %d methods: %s", len(methods), methods)
         
         # Update status to success
         status_text = f"✅ Found {len(methods)} methods in toolgroup '{toolgroup_name}'"
@@ -446,13 +903,28 @@ class MCPTestTab:
         if not method_name:
             return "❌ Please select a method first"
         
+        # Parse parameters; empty input and the default "{}" skip JSON parsing entirely
+        try:
+            if not params_json or params_json.isspace() or params_json == "{}":
+                params = {}
+            else:
+                params = _json_loads(params_json)
+        except json.JSONDecodeError:
+            return "❌ Invalid JSON parameters. Please check your input."
+        
+        if not isinstance(params, list):
+            return self._invoke_tool(toolgroup_name, method_name, params)
+        
+        # A JSON list of argument objects runs the method once per object, concurrently
+        if not params or not all(isinstance(kwargs, dict) for kwargs in params):
+            return "❌ A parameter list must contain one or more JSON objects."
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(params), MCP_BATCH_WORKERS)) as pool:
+            results = list(pool.map(lambda kwargs: self._invoke_tool(toolgroup_name, method_name, kwargs), params))
+        return "\n\n".join(f"[{i}/{len(results)}] {result}" for i, result in enumerate(results, 1))
+    
+    def _invoke_tool(self, toolgroup_name: str, method_name: str, params: dict) -> str:
+        """Invoke one MCP method with the given arguments and format the result"""
         try:
-            # Parse parameters
-            try:
-                params = json.loads(params_json) if params_json.strip() else {}
-            except json.JSONDecodeError:
-                return "❌ Invalid JSON parameters. Please check your input."
-            
             # Execute tool through Llama Stack using tool_runtime
             result = self.client.tool_runtime.invoke_tool(
                 tool_name=method_name,
@@ -460,20 +932,15 @@ class MCPTestTab:
             )
             
             if result:
-                self.logger.debug(f"Result: {result}")
+                # Lazy %s formatting: the repr of a large result is only built when DEBUG is on
+                self.logger.debug("Result: %s", result)
                 # Extract the actual result data from ToolInvocationResult
                 try:
                     # Handle ToolInvocationResult structure
                     if hasattr(result, 'content') and result.content:
                         # Extract text from TextContentItem objects
                         if isinstance(result.content, list):
-                            text_parts = []
-                            for item in result.content:
-                                if hasattr(item, 'text'):
-                                    text_parts.append(item.text)
-                                else:
-                                    text_parts.append(str(item))
-                            result_data = '\n'.join(text_parts)
+                            result_data = '\n'.join(_extract_text(item) for item in result.content)
                         else:
                             result_data = str(result.content)
                     elif hasattr(result, 'text'):
@@ -484,16 +951,23 @@ class MCPTestTab:
                         # Fallback: convert to string representation
                         result_data = str(result)
                     
-                    # Try to format as JSON if it's a dict/list, otherwise use string
-                    if isinstance(result_data, (dict, list)):
-                        formatted_result = json.dumps(result_data, indent=2)
+                    # Text results are used as-is; only structured data is formatted as JSON
+                    if isinstance(result_data, str):
+                        formatted_result = result_data
+                    elif isinstance(result_data, (dict, list)):
+                        formatted_result = _json_dumps_pretty(result_data)
                     else:
                         formatted_result = str(result_data)
-                        
+                    
+                    # Bound the size of what is rendered in the Code Canvas
+                    if len(formatted_result) > MCP_RESULT_TRUNCATE:
+                        omitted = len(formatted_result) - MCP_RESULT_TRUNCATE
+                        formatted_result = f"{formatted_result[:MCP_RESULT_TRUNCATE]}\n... [truncated {omitted} characters]"
+                    
                     return f"✅ Method '{method_name}' from toolgroup '{toolgroup_name}' executed successfully:\n\n```\n{formatted_result}\n```"
                 except Exception as format_error:
                     # If JSON formatting fails, return as string
-                    return f"✅ Method '{method_name}' from toolgroup '{toolgroup_name}' executed successfully:\n\n```\n{str(result)}\n```"
+                    return f"✅ Method '{method_name}' from toolgroup '{toolgroup_name}' executed successfully:\n\n```\n{result}\n```"
             else:
                 return f"❌ Method '{method_name}' from toolgroup '{toolgroup_name}' failed: No result returned"
                 
@@ -504,14 +978,84 @@ class MCPTestTab:
 class SystemStatusTab:
     """Handles system status functionality"""
     
+    __slots__ = ("client", "llama_stack_url", "model", "logger", "_status_cache", "_status_lock")
+    
     def __init__(self, client: LlamaStackClient, llama_stack_url: str, model: str):
         self.client = client
         self.llama_stack_url = llama_stack_url
         self.model = model
         self.logger = get_logger("system")
+        # Last rendered report per (llama_stack_url, model) as (timestamp, report)
+        self._status_cache = {}
+        self._status_lock = threading.Lock()
     
     def get_system_status(self) -> str:
-        """Get comprehensive system status with better structure"""
+        """Get comprehensive system status, reusing a recent report within STATUS_CACHE_TTL"""
+        cache_key = f"{self.llama_stack_url}|{self.model}"
+        # Handlers run on Gradio worker threads; concurrent clicks wait for one build instead of probing twice
+        with self._status_lock:
+            entry = self._status_cache.get(cache_key)
+            if entry is not None and time.monotonic() - entry[0] < STATUS_CACHE_TTL:
+                self.logger.debug("Returning cached system status report")
+                return entry[1]
+            
+            report = self._build_system_status()
+            self._status_cache[cache_key] = (time.monotonic(), report)
+            return report
+    
+    def _probe_llm(self) -> list:
+        """Check the LLM service and return its status lines"""
+        if not STATUS_DEEP_HEALTH:
+            # Light check: make sure the model is registered without spending tokens
+            model_ids = [getattr(m, 'identifier', None) for m in self.client.models.list()]
+            if self.model in model_ids:
+                return ["   • Status: ✅ LLM service reachable", f"   • Model: {self.model}"]
+            return ["   • Status: ⚠️ Model not registered in Llama Stack", f"   • Model: {self.model}"]
+        
+        # Deep check: run a real one-token chat.completions.create request against the model
+        test_response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "user", "content": "ping"}
+            ],
+            temperature=0.0,
+            max_tokens=1,
+            stream=False,
+        )
+        
+        # Extract response content for length calculation
+        if hasattr(test_response, 'messages') and test_response.messages:
+            last_message = test_response.messages[-1]
+            response_content = getattr(last_message, 'content', str(last_message))
+        else:
+            response_content = str(test_response)
+        
+        return [
+            "   • Status: ✅ LLM service responding",
+            f"   • Model: {self.model}",
+            f"   • Response: ✅ Received {len(response_content)} characters",
+        ]
+    
+    def _build_system_status(self) -> str:
+        """Build the system status report by probing each backend concurrently"""
+        
+        # Run the independent probes in parallel so the report takes as long as the slowest one
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        futures = {
+            "version": executor.submit(self.client.inspect.version),
+            "health": executor.submit(self.client.inspect.health),
+            "llm": executor.submit(self._probe_llm),
+            "tools": executor.submit(tools_cache.get, self.client),
+        }
+        concurrent.futures.wait(futures.values(), timeout=HEALTH_TIMEOUT)
+        # Don't block on probes that exceeded the timeout
+        executor.shutdown(wait=False)
+        
+        def probe_result(name):
+            future = futures[name]
+            if not future.done():
+                raise TimeoutError(f"No response within {HEALTH_TIMEOUT:g}s")
+            return future.result()
         
         # 1. Gradio Health
         gradio_status = "✅ Gradio Application: Running and accessible"
@@ -520,276 +1064,137 @@ class SystemStatusTab:
         self.logger.debug("Testing MCP connection directly...")
         try:
             # Test if we can list tools
-            tools = self.client.tools.list()
+            tools = probe_result("tools")
             self.logger.info(f"MCP tools.list() returned: {len(tools)} tools")
             
             # Test if we can invoke a simple tool
             if tools:
                 first_tool = tools[0]
-                self.logger.debug(f"First tool: {first_tool}")
-                if hasattr(first_tool, 'name'):
-                    self.logger.debug(f"First tool name: {first_tool.name}")
+                self.logger.debug("First tool: %s", first_tool)
+                self.logger.debug("First tool name: %s", _tool_name(first_tool))
         except Exception as e:
+            tools = None
+            tools_error = e
             self.logger.error(f"MCP test failed: {str(e)}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Traceback: %s", traceback.format_exc())
+        
+        # Build the whole report in a single list and join it once at the end
+        lines = [SEP, "🔍 SYSTEM STATUS REPORT", SEP, "", gradio_status, ""]
         
         # 2. Llama Stack Server Health and Version
-        llama_stack_status = []
-        llama_stack_status.append("🚀 Llama Stack Server:")
-        llama_stack_status.append(f"   • URL: {self.llama_stack_url}")
+        lines.append("🚀 Llama Stack Server:")
+        lines.append(f"   • URL: {self.llama_stack_url}")
         
         try:
             # Get version information
-            version_info = self.client.inspect.version()
-            llama_stack_status.append(f"   • Version: ✅ {version_info.version}")
+            version_info = probe_result("version")
+            lines.append(f"   • Version: ✅ {version_info.version}")
             
             # Get health information
-            health_info = self.client.inspect.health()
-            llama_stack_status.append(f"   • Health: ✅ {health_info.status}")
+            health_info = probe_result("health")
+            lines.append(f"   • Health: ✅ {health_info.status}")
             
         except Exception as e:
-            llama_stack_status.append("   • Status: ❌ Failed to connect to Llama Stack server")
-            llama_stack_status.append(f"   • Error: {str(e)}")
+            lines.append("   • Status: ❌ Failed to connect to Llama Stack server")
+            lines.append(f"   • Error: {str(e)}")
         
         # 3. LLM Service (Inference)
-        llm_status = []
-        llm_status.append("🤖 LLM Service (Inference):")
+        lines.append("")
+        lines.append("🤖 LLM Service (Inference):")
         
-        # Test LLM connectivity with a direct chat.completions.create request
         try:
-            test_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": "Hello, this is a test message."}
-                ],
-                temperature=0.7,
-                max_tokens=100,
-                stream=False,
-            )
-            llm_status.append("   • Status: ✅ LLM service responding")
-            llm_status.append(f"   • Model: {self.model}")
+            lines.extend(probe_result("llm"))
         except Exception as e:
-            llm_status.append("   • Status: ❌ LLM service not responding")
-            llm_status.append(f"   • Error: {str(e)}")
-            test_response = None
+            lines.append("   • Status: ❌ LLM service not responding")
+            lines.append(f"   • Error: {str(e)}")
         
-        # Extract response content for length calculation
-        if hasattr(test_response, 'messages') and test_response.messages:
-            last_message = test_response.messages[-1]
-            response_content = getattr(last_message, 'content', str(last_message))
+        # 4. MCP Server
+        lines.append("")
+        lines.append("☸️ MCP Server:")
+        
+        if tools is None:
+            lines.append("   • Status: ❌ MCP server not responding")
+            lines.append(f"   • Error: {str(tools_error)}")
         else:
-            response_content = str(test_response)
+            # Extract unique toolgroup IDs
+            toolgroups = list(dict.fromkeys(tool.toolgroup_id for tool in tools))
+            lines.append("   • Status: ✅ MCP server responding")
+            lines.append(f"   • Toolgroups: ✅ Found {len(toolgroups)} toolgroup(s)")
+            
+            # List all toolgroup identifiers as a simple list
+            if toolgroups:
+                lines.append("   • Toolgroup IDs:")
+                lines.extend(f"      - {toolgroup_id}" for toolgroup_id in toolgroups)
         
-        llm_status.append(f"   • Response: ✅ Received {len(response_content)} characters")
+        lines.append("")
+        lines.append(SEP)
         
-        # 4. MCP Server
-        mcp_status = []
-        mcp_status.append("☸️ MCP Server:")
-        
-        # List tools to check MCP server connectivity
-        tools = self.client.tools.list()
-        
-        # Extract unique toolgroup IDs
-        toolgroups = list(set(tool.toolgroup_id for tool in tools))
-        mcp_status.append("   • Status: ✅ MCP server responding")
-        mcp_status.append(f"   • Toolgroups: ✅ Found {len(toolgroups)} toolgroup(s)")
-        
-        # List all toolgroup identifiers as a simple list
-        if toolgroups:
-            mcp_status.append("   • Toolgroup IDs:")
-            for toolgroup_id in toolgroups:
-                mcp_status.append(f"      - {toolgroup_id}")
-        
-        # Combine all status information
-        full_status = "\n".join([
-            "=" * 60,
-            "🔍 SYSTEM STATUS REPORT",
-            "=" * 60,
-            "",
-            gradio_status,
-            "",
-            "\n".join(llama_stack_status),
-            "",
-            "\n".join(llm_status),
-            "",
-            "\n".join(mcp_status),
-            "",
-            "=" * 60
-        ])
-        
-        return full_status
+        return "\n".join(lines)
+
+
+# Stylesheet for the Gradio Blocks layout, linked from <head> as a static asset so browsers
+# cache it across sessions; the content hash in the URL refreshes that cache when it changes
+_DEMO_CSS_VERSION = hashlib.sha256((Path(__file__).parent / "assets" / "app.css").read_bytes()).hexdigest()[:12]
+_DEMO_HEAD = f'<link rel="stylesheet" href="/gradio_api/file=assets/app.css?v={_DEMO_CSS_VERSION}">'
+
+
+# Page header with the chatbot logo and titles
+_HEADER_HTML = """
+<div class="header-container">
+    <div class="header-content">
+        <div class="header-left">
+            <img class="logo" src="/gradio_api/file=assets/logo.svg" width="50" height="50" alt="Intelligent CD Chatbot logo">
+            <div>
+                <div class="header-title">Intelligent CD Chatbot</div>
+                <div class="header-subtitle">AI-Powered GitOps Deployment Assistant</div>
+            </div>
+        </div>
+        <div class="header-right">
+            <div style="text-align: right;">
+                <div style="font-size: 0.8em; opacity: 0.7; margin-bottom: 2px;">
+                    Powered by
+                </div>
+                <div style="font-size: 1.2em; font-weight: bold; opacity: 0.9;">
+                    Red Hat AI
+                </div>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+
+def _format_execute_result(mcp_test_tab: MCPTestTab, toolgroup: str, method: str, params: str) -> str:
+    """Execute an MCP method and format the result for the Code Canvas"""
+    return f"🧪 MCP Method Execution: {method}\n\n{mcp_test_tab.execute_tool(toolgroup, method, params)}"
+
+
+# Placeholder dropdown choices until toolgroups/methods are loaded
+_EMPTY_TOOLGROUPS = ("Select a toolgroup...",)
+_EMPTY_METHODS = ("Select a method...",)
+
+# Avatar image for assistant messages
+_CHATBOT_AVATAR = "assets/chatbot.png"
+
+# Greeting shown when the chat opens, in the dict form used by Chatbot(type="messages")
+_INITIAL_HISTORY = ({"role": "assistant", "content": "Hello, how can I help you?"},)
 
 
 def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab: SystemStatusTab):
     """Create the beautiful Gradio interface with header and chat"""
+    import gradio as gr
     
     with gr.Blocks(
         title="Intelligent CD Chatbot",
         # https://www.gradio.app/guides/theming-guide
         theme=gr.themes.Soft(),  # Fixed light theme - no dark mode switching
-        css="""
-        /* Full screen responsive layout */
-        .gradio-container {
-            max-width: 100vw !important;
-            width: 100vw !important;
-            padding: 0 !important;
-            margin: 0 !important;
-        }
-        
-        /* Main content area - full width */
-        .main-panel {
-            width: 100% !important;
-            max-width: 100% !important;
-        }
-        
-        /* Header styling */
-        .header-container {
-            background: linear-gradient(135deg, #ff8c42 0%, #ffa726 50%, #ff7043 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 0 0 15px 15px;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-            width: 100% !important;
-        }
-        
-        .header-content {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }
-        
-        .header-left {
-            display: flex;
-            align-items: center;
-            gap: 15px;
-        }
-        
-        .logo {
-            width: 50px;
-            height: 50px;
-            border-radius: 10px;
-        }
-        
-        .header-title {
-            font-size: 2.2em;
-            font-weight: bold;
-            margin: 0;
-            text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-        }
-        
-        .header-subtitle {
-            font-size: 1.1em;
-            opacity: 0.95;
-            margin: 5px 0 0 0;
-            text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-        }
-        
-        .header-right {
-            display: flex;
-            align-items: center;
-            gap: 15px;
-        }
-        
-        /* Chat input and buttons layout */
-        .chat-input-container {
-            display: flex !important;
-            gap: 10px !important;
-            align-items: flex-start !important;
-            width: 100% !important;
-        }
-        
-        .chat-input-field {
-            flex: 1 !important;
-            min-width: 0 !important;
-        }
-        
-        .chat-buttons-column {
-            display: flex !important;
-            flex-direction: column !important;
-            gap: 8px !important;
-            flex-shrink: 0 !important;
-        }
-        
-
-        
-        /* Ensure both panels have equal heights */
-        .equal-height-panels {
-            display: flex !important;
-            align-items: stretch !important;
-        }
-        
-        /* Status indicator styling */
-        .status-ready {
-            background-color: #e8f5e8 !important;
-            border-color: #4caf50 !important;
-            color: #2e7d32 !important;
-        }
-        
-        .status-loading {
-            background-color: #fff3e0 !important;
-            border-color: #ff9800 !important;
-            color: #e65100 !important;
-        }
-        
-        .status-error {
-            background-color: #ffebee !important;
-            border-color: #f44336 !important;
-            color: #c62828 !important;
-        }
-        
-        .status-success {
-            background-color: #e8f5e8 !important;
-            border-color: #4caf50 !important;
-            color: #2e7d32 !important;
-        }
-        
-        /* Responsive adjustments */
-        @media (max-width: 768px) {
-            .header-title {
-                font-size: 1.8em !important;
-            }
-            .header-subtitle {
-                font-size: 1em !important;
-            }
-        }
-        """
+        analytics_enabled=False,  # Skip Gradio's usage telemetry requests at startup
+        head=_DEMO_HEAD,
     ) as demo:
         
         # Beautiful Header with Logo
-        with gr.Row():
-            with gr.Column(scale=1):
-                gr.HTML("""
-                <div class="header-container">
-                    <div class="header-content">
-                        <div class="header-left">
-                            <svg class="logo" version="1.0" xmlns="http://www.w3.org/2000/svg" width="50" height="50" viewBox="0 0 300 300" preserveAspectRatio="xMidYMid meet">
-                                <g transform="translate(0.000000,300.000000) scale(0.100000,-0.100000)" fill="currentColor" stroke="none">
-                                    <path d="M1470 2449 c-47 -10 -80 -53 -80 -105 0 -45 26 -88 61 -99 18 -6 19 -14 17 -138 l-3 -132 -37 -3 -38 -3 0 48 c0 43 -4 53 -34 82 -32 31 -35 38 -33 87 2 46 -2 57 -27 83 -36 38 -74 46 -120 27 -70 -29 -86 -125 -30 -177 20 -19 36 -24 79 -24 70 0 95 -22 95 -82 l0 -43 -162 0 c-108 -1 -175 -5 -200 -14 -98 -35 -168 -134 -178 -250 l-5 -69 -44 -11 c-69 -17 -85 -47 -90 -164 -5 -147 17 -194 102 -211 l32 -7 5 -80 c4 -64 11 -90 36 -134 50 -88 141 -140 247 -140 l47 0 0 -135 c0 -122 2 -137 20 -155 11 -11 29 -20 40 -20 21 0 31 8 233 193 l129 117 226 0 c125 0 244 5 264 10 62 18 128 71 162 130 25 44 32 70 36 134 l5 79 44 11 c74 18 86 45 86 186 0 141 -12 168 -86 186 l-44 11 -6 74 c-10 113 -58 187 -153 234 -47 24 -59 25 -218 25 l-168 0 0 40 c0 53 38 91 85 83 60 -10 125 46 125 107 0 38 -30 81 -67 96 -45 19 -83 11 -119 -27 -25 -26 -29 -37 -27 -83 2 -49 -1 -56 -33 -87 -30 -29 -34 -39 -34 -82 l0 -48 -37 3 -38 3 -3 132 c-2 124 -1 132 17 138 35 11 61 54 61 99 0 75 -62 122 -140 105z m65 -79 c27 -30 7 -70 -35 -70 -42 0 -62 40 -35 70 10 11 26 20 35 20 9 0 25 -9 35 -20z m-281 -152 c16 -26 -4 -53 -40 -53 -23 0 -30 5 -32 23 -7 47 47 69 72 30z m556 8 c6 -8 10 -25 8 -38 -6 -42 -78 -32 -78 11 0 37 46 55 70 27z m-4 -376 c182 0 193 -1 225 -23 19 -12 44 -42 57 -67 21 -43 22 -54 22 -330 0 -276 -1 -287 -22 -330 -13 -25 -38 -55 -57 -67 -33 -22 -41 -23 -288 -23 l-253 0 -91 -82 c-50 -46 -109 -98 -130 -116 l-39 -34 0 96 c0 130 -6 136 -134 136 -111 0 -147 18 -183 90 -22 43 -23 54 -23 330 0 277 1 287 23 330 25 50 60 79 106 89 17 3 159 5 314 3 155 -1 368 -2 473 -2z"/>
-                                    <path d="M1159 1621 c-80 -80 12 -215 114 -166 52 24 74 79 53 129 -30 71 -114 90 -167 37z"/>
-                                    <path d="M1702 1625 c-60 -50 -47 -142 24 -171 45 -19 78 -12 115 26 90 89 -42 226 -139 145z"/>
-                                    <path d="M1280 1269 c-10 -17 -6 -25 25 -54 91 -86 299 -86 390 0 31 29 35 37 25 54 -15 28 -31 26 -95 -10 -47 -26 -65 -31 -125 -31 -59 0 -78 5 -127 31 -67 37 -79 38 -93 10z"/>
-                                </g>
-                            </svg>
-                            <div>
-                                <div class="header-title">Intelligent CD Chatbot</div>
-                                <div class="header-subtitle">AI-Powered GitOps Deployment Assistant</div>
-                            </div>
-                        </div>
-                        <div class="header-right">
-                            <div style="text-align: right;">
-                                <div style="font-size: 0.8em; opacity: 0.7; margin-bottom: 2px;">
-                                    Powered by
-                                </div>
-                                <div style="font-size: 1.2em; font-weight: bold; opacity: 0.9;">
-                                    Red Hat AI
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """)
+        gr.HTML(_HEADER_HTML)
         
         # Top Right Controls - Removed for cleaner interface
         
@@ -799,33 +1204,30 @@ def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab:
             with gr.Column(scale=2):
                 # Tab system for different interfaces
                 with gr.Tabs():
-                    # Chat Tab
+                    # Chat Tab - chat history above the input, stacked by the tab itself
                     with gr.TabItem("💬 Chat"):
-                        # Vertical layout: Chat history (7) and input (3)
-                        with gr.Column():
-                            # Chat Interface - Takes most of the space (scale 7)
-                            with gr.Column(scale=7):
-                                history = [gr.ChatMessage(role="assistant", content="Hello, how can I help you?")]
-                                
-                                chatbot = gr.Chatbot(history,
-                                    label="💬 Chat with AI Assistant",
-                                    show_label=False,
-                                    avatar_images=["assets/chatbot.png", "assets/chatbot.png"],
-                                    type="messages",
-                                    layout="panel"
-                                )
-                            
-                            # Chat Input - Takes less space (scale 3)
-                            with gr.Column(scale=3):
-                                msg = gr.Textbox(
-                                    label="Message",
-                                    show_label=False,
-                                    placeholder="Ask me about Kubernetes, GitOps, or OpenShift deployments... (Press Enter to send, Shift+Enter for new line)",
-                                    lines=2,
-                                    max_lines=4,
-                                    submit_btn=True,
-                                    stop_btn=True
-                                )
+                        chatbot = gr.Chatbot(list(_INITIAL_HISTORY),
+                            label="💬 Chat with AI Assistant",
+                            show_label=False,
+                            avatar_images=(None, _CHATBOT_AVATAR),  # Only the assistant gets an avatar
+                            type="messages",
+                            render_markdown=True,
+                            layout="panel"
+                        )
+                        # Canonical chat history kept server-side so the browser doesn't upload it on every message
+                        chat_state = gr.State(list(_INITIAL_HISTORY))
+                        # Agent session for this browser session, created on the first message and deleted when the page closes
+                        chat_session = gr.State(None, delete_callback=chat_tab.end_session)
+                        
+                        msg = gr.Textbox(
+                            label="Message",
+                            show_label=False,
+                            placeholder="Ask me about Kubernetes, GitOps, or OpenShift deployments... (Press Enter to send, Shift+Enter for new line)",
+                            lines=2,
+                            max_lines=4,
+                            submit_btn=True,
+                            stop_btn=True
+                        )
                     
                     # MCP Test Tab
                     with gr.TabItem("🧪 MCP Test"):
@@ -843,17 +1245,19 @@ def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab:
                             refresh_toolgroups_btn = gr.Button("🔄ToolGroups", variant="secondary", size="md", scale=1)
                             refresh_methods_btn = gr.Button("🔄Methods", variant="secondary", size="md", scale=1)
 
+                        # Toolgroups are baked in from the tools cache; the button only forces a refetch
+                        toolgroups = mcp_test_tab.initial_toolgroups()
                         toolgroup_selector = gr.Dropdown(
-                            choices=["Select a toolgroup..."],
+                            choices=toolgroups or _EMPTY_TOOLGROUPS,
                             label="Select Toolgroup",
-                            value="Select a toolgroup...",
+                            value=None if toolgroups else _EMPTY_TOOLGROUPS[0],
                             interactive=True
                         )
 
                         method_selector = gr.Dropdown(
-                            choices=["Select a method..."],
+                            choices=_EMPTY_METHODS,
                             label="Select Method",
-                            value="Select a method...",
+                            value=_EMPTY_METHODS[0],
                             interactive=True
                         )
 
@@ -862,7 +1266,7 @@ def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab:
                         with gr.Group():
                             # gr.Markdown("**Parameters:**")
                             params_input = gr.Textbox(
-                                label="Parameters (JSON)",
+                                label="Parameters (JSON object, or a list of objects to run the method once per object)",
                                 placeholder='{"namespace": "default"}',
                                 lines=3,
                                 value='{}'
@@ -897,7 +1301,7 @@ def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab:
         # Event handlers     
         # Refresh Toolgroups Button (next to dropdown)
         refresh_toolgroups_btn.click(
-            fn=mcp_test_tab.list_toolgroups,
+            fn=mcp_test_tab.refresh_toolgroups,
             outputs=[toolgroup_selector]
         )
         
@@ -909,22 +1313,32 @@ def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab:
         )
         
         execute_btn.click(
-            fn=lambda toolgroup, method, params: f"🧪 MCP Method Execution: {method}\n\n{mcp_test_tab.execute_tool(toolgroup, method, params)}",
+            fn=functools.partial(_format_execute_result, mcp_test_tab),
             inputs=[toolgroup_selector, method_selector, params_input],
             outputs=content_area
         )
         
         # System Status Tab functionality
         check_status_btn.click(
-            fn=lambda: f"{system_status_tab.get_system_status()}",
+            fn=system_status_tab.get_system_status,
             outputs=content_area
         )
         
+        # The Chatbot's clear button only empties the display; drop the history State and agent session too
+        chatbot.clear(
+            fn=chat_tab.clear_chat,
+            inputs=[chat_session],
+            outputs=[chat_state, chat_session],
+        )
+        
         # Chat functionality - using built-in submit button
         msg.submit(
             fn=chat_tab.chat_completion,
-            inputs=[msg, chatbot],
-            outputs=[chatbot, msg]
+            inputs=[msg, chat_state, chat_session],
+            outputs=[chatbot, chat_state, chat_session, msg],
+            api_name="chat",
+            show_progress="minimal",  # Tokens stream into the bubble, no full-screen spinner
+            trigger_mode="once"  # Ignore repeated Enter presses while a response is pending
         )
         
 
@@ -932,71 +1346,88 @@ def create_demo(chat_tab: ChatTab, mcp_test_tab: MCPTestTab, system_status_tab:
     return demo
 
 
-def initialize_llama_stack_client() -> tuple[LlamaStackClient, ChatTab, MCPTestTab, SystemStatusTab]:
+def initialize_llama_stack_client(config: AppConfig) -> tuple[LlamaStackClient, ChatTab, MCPTestTab, SystemStatusTab]:
     """Initialize Llama Stack client and all tab classes"""
+    import httpx
+    from llama_stack_client import LlamaStackClient
+    
     # Get logger for initialization
     logger = get_logger("init")
     
-    # ALL CONFIGURATION IN ONE PLACE - including environment variable reading
-    llama_stack_url = os.getenv("LLAMA_STACK_URL", "http://localhost:8321")
-    model = os.getenv("DEFAULT_LLM_MODEL", "llama-3-2-3b")
-    
-    logger.info("=" * 60)
-    logger.info("INITIALIZING LLAMA STACK CLIENT")
-    logger.info("=" * 60)
-    
-    # Log environment variables
-    logger.info("Environment Variables:")
-    logger.info(f"  LLAMA_STACK_URL: {os.getenv('LLAMA_STACK_URL', 'Not set (using default)')}")
-    logger.info(f"  DEFAULT_LLM_MODEL: {os.getenv('DEFAULT_LLM_MODEL', 'Not set (using default)')}")
-    
-    # Log final configuration
-    logger.info("Final Configuration:")
-    logger.info(f"  Llama Stack URL: {llama_stack_url}")
-    logger.info(f"  Model: {model}")
-    
-    llama_stack_client = LlamaStackClient(base_url=llama_stack_url)
-    logger.info(f"Llama Stack client initialized successfully with URL: {llama_stack_url}")
-    
-    # Define sampling parameters - ALL CONFIGURATION IN ONE PLACE
-    sampling_params = {
-        "temperature": 0.7,
-        "max_tokens": 4096,
-        "strategy": {"type": "greedy"}  # Added strategy like in the working example
-    }
+    # Log the resolved configuration as a single block
+    if logger.isEnabledFor(logging.INFO):
+        lines = [
+            SEP,
+            "INITIALIZING LLAMA STACK CLIENT",
+            SEP,
+            "Environment Variables:",
+            f"  LLAMA_STACK_URL: {os.environ.get('LLAMA_STACK_URL', 'Not set (using default)')}",
+            f"  DEFAULT_LLM_MODEL: {os.environ.get('DEFAULT_LLM_MODEL', 'Not set (using default)')}",
+            "Final Configuration:",
+            f"  Llama Stack URL: {config.llama_stack_url}",
+            f"  Model: {config.model}",
+            f"  Builtin tools enabled: {config.enable_builtin_tools}",
+            f"  App environment: {config.app_env}",
+        ]
+        if config.enable_builtin_tools:
+            lines.append("  Note: Builtin tools require API keys (TAVILY_SEARCH_API_KEY, etc.)")
+        logger.info("\n".join(lines))
     
-    # Configuration for builtin tools
-    enable_builtin_tools = os.getenv("ENABLE_BUILTIN_TOOLS", "false").lower() == "true"
+    # One pooled HTTP client with keep-alive shared by every Llama Stack call; sized for
+    # concurrent chat sessions, tool executions and the parallel status probes
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        transport=httpx.HTTPTransport(
+            retries=2,  # Retry failed connection attempts instead of surfacing them to the user
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        ),
+    )
+    atexit.register(http_client.close)
     
-    logger.info("=" * 60)
-    logger.info(f"Builtin tools enabled: {enable_builtin_tools}")
-    if enable_builtin_tools:
-        logger.info("Note: Builtin tools require API keys (TAVILY_SEARCH_API_KEY, etc.)")
+    llama_stack_client = LlamaStackClient(base_url=config.llama_stack_url, http_client=http_client)
+    logger.info(f"Llama Stack client initialized successfully with URL: {config.llama_stack_url}")
     
     # Initialize tab classes with shared client
-    chat_tab = ChatTab(llama_stack_client, model=model, sampling_params=sampling_params, enable_builtin_tools=enable_builtin_tools)
+    chat_tab = ChatTab(
+        llama_stack_client,
+        model=config.model,
+        sampling_params=dict(config.sampling_params),
+        enable_builtin_tools=config.enable_builtin_tools,
+    )
     mcp_test_tab = MCPTestTab(llama_stack_client)
-    system_status_tab = SystemStatusTab(llama_stack_client, llama_stack_url, model=model)
+    system_status_tab = SystemStatusTab(llama_stack_client, config.llama_stack_url, model=config.model)
     
-    logger.info("All tab classes initialized successfully")
-    logger.info("=" * 60)
+    logger.info(f"All tab classes initialized successfully\n{SEP}")
     return llama_stack_client, chat_tab, mcp_test_tab, system_status_tab
 
 def main():
     """Main function to launch the Gradio app"""
+    # ALL CONFIGURATION IN ONE PLACE - including environment variable reading
+    config = AppConfig.from_env()
+    
     # Initialize Llama Stack client and tab classes
-    llama_stack_client, chat_tab, mcp_test_tab, system_status_tab = initialize_llama_stack_client()
+    llama_stack_client, chat_tab, mcp_test_tab, system_status_tab = initialize_llama_stack_client(config)
     
     # Create the Gradio demo with tab instances
     demo = create_demo(chat_tab, mcp_test_tab, system_status_tab)
     
+    # Run event handlers through Gradio's queue so long LLM/MCP calls don't block other users;
+    # each browser session has its own agent session, so chats from different users run side by side
+    demo.queue(default_concurrency_limit=8, max_size=64)
+    
+    # Verbose debugging and tracebacks in the browser only for local development
+    is_dev = config.app_env == "dev"
+    
     # Launch the app
     demo.launch(
         server_name="0.0.0.0",
         server_port=7860,
         share=False,
-        debug=True,
-        show_error=True
+        quiet=True,
+        allowed_paths=["assets"],  # Serve the header logo and stylesheet from assets/
+        debug=is_dev,
+        show_error=is_dev,
+        max_threads=40
     )
 
 
@@ -1,28 +1,94 @@
+import atexit
 import json
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 from sseclient import SSEClient
+from urllib3.util.retry import Retry
 import time
 
+# orjson is optional; it speeds up parsing and printing large tool schemas and results
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # --- Global State and Configuration ---
 SERVER_URL = "http://localhost:3000"
 SSE_URL = f"{SERVER_URL}/sse"
 MESSAGES_URL = f"{SERVER_URL}/messages"
 SESSION_ID = None
 STOP_EVENT = threading.Event()
+SESSION_READY = threading.Event()  # Set once the session is established or the listener stops
+SESSION_TIMEOUT = 10  # Seconds to wait for the SSE session before giving up
 REQUEST_ID = 1 # A simple counter for JSON-RPC requests
-EXPECTING_TOOL_NAMES = False  # Flag to track when we're expecting just tool names
-EXPECTING_TOOL_INFO = False  # Flag to track when we're expecting tool info for filtering
-REQUESTED_TOOL_NAME = None  # Store the requested tool name for filtering
+PENDING = {}  # JSON-RPC request ID -> callback for its result, run on the SSE listener thread
+PENDING_LOCK = threading.Lock()
+TOOLS_CACHE_TTL = 30  # Seconds to serve tool names/info from the last tools/list result
+TOOLS_CACHE = {"tools": None, "ts": 0.0}  # Last tools/list result, filled by the SSE listener
+
+# Shared session so the SSE stream and every command POST reuse pooled keep-alive connections
+HTTP = requests.Session()
+HTTP.headers["Content-Type"] = "application/json"
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.1))
+HTTP.mount("http://", _adapter)
+HTTP.mount("https://", _adapter)
+atexit.register(HTTP.close)
+
+# --- JSON Helpers ---
+def parse_json(text: str):
+    """Parses a JSON string, raising json.JSONDecodeError on invalid input (orjson's error subclasses it)."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def pretty_json(data) -> str:
+    """Formats data as JSON with a 2-space indent."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+# Encoded tail of parameterless commands (e.g. tools/list); only the request id changes per call
+_STATIC_BODY_TAILS = {}
+
+def encode_request(method: str, params: dict, request_id: int) -> bytes:
+    """Encodes a JSON-RPC request body, reusing the pre-encoded tail for commands without params."""
+    if params:
+        return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}).encode()
+    tail = _STATIC_BODY_TAILS.get(method)
+    if tail is None:
+        tail = _STATIC_BODY_TAILS[method] = (", " + json.dumps({"method": method, "params": {}})[1:]).encode()
+    return b'{"jsonrpc": "2.0", "id": ' + str(request_id).encode() + tail
+
+# --- Tool List Helpers ---
+def print_tool_names(tools: list):
+    """Prints the names of the given tools."""
+    print("\n--- Tool Names ---")
+    for tool in tools:
+        print(f"• {tool['name']}")
+    print(f"Total: {len(tools)} tools")
+
+def print_tool_info(tools: list, tool_name: str):
+    """Prints the full definition of one tool from the given tools."""
+    for tool in tools:
+        if tool['name'] == tool_name:
+            print(f"\n--- Tool Info for '{tool_name}' ---")
+            print(pretty_json(tool))
+            return
+    print(f"\nTool '{tool_name}' not found.")
+
+def cached_tools():
+    """Returns the cached tools/list result if it is still fresh, otherwise None."""
+    if TOOLS_CACHE["tools"] is not None and time.monotonic() - TOOLS_CACHE["ts"] < TOOLS_CACHE_TTL:
+        return TOOLS_CACHE["tools"]
+    return None
 
 # --- SSE Listener Thread ---
 def sse_listener():
     """Listens for events on the SSE stream and handles the session."""
-    global SESSION_ID, EXPECTING_TOOL_NAMES, EXPECTING_TOOL_INFO, REQUESTED_TOOL_NAME
+    global SESSION_ID
 
     print("Connecting to SSE stream...")
     try:
-        client = SSEClient(SSE_URL)
+        client = SSEClient(SSE_URL, session=HTTP)
         for event in client:
             if STOP_EVENT.is_set():
                 break
@@ -35,36 +101,27 @@ def sse_listener():
             if event_data.startswith("/messages?sessionId="):
                 session_id = event_data.split("=")[1]
                 SESSION_ID = session_id
+                SESSION_READY.set()
                 print(f"Session established. Session ID: {SESSION_ID}")
                 print("You can now send commands from the main thread.")
             else:
                 try:
-                    data = json.loads(event_data)
+                    data = parse_json(event_data)
+                    result = data.get('result') if isinstance(data, dict) else None
+                    is_tools_list = isinstance(result, dict) and 'tools' in result
                     
-                    # Check if this is a response to tools/list and we're expecting just names
-                    if EXPECTING_TOOL_NAMES and 'result' in data and 'tools' in data['result']:
-                        print("\n--- Tool Names ---")
-                        for tool in data['result']['tools']:
-                            print(f"• {tool['name']}")
-                        print(f"Total: {len(data['result']['tools'])} tools")
-                        EXPECTING_TOOL_NAMES = False
-                    # Check if this is a response to tools/list and we're expecting tool info for filtering
-                    elif EXPECTING_TOOL_INFO and 'result' in data and 'tools' in data['result']:
-                        tool_found = False
-                        for tool in data['result']['tools']:
-                            if tool['name'] == REQUESTED_TOOL_NAME:
-                                print(f"\n--- Tool Info for '{REQUESTED_TOOL_NAME}' ---")
-                                print(json.dumps(tool, indent=2))
-                                tool_found = True
-                                break
-                        
-                        if not tool_found:
-                            print(f"\nTool '{REQUESTED_TOOL_NAME}' not found.")
-                        
-                        EXPECTING_TOOL_INFO = False
-                        REQUESTED_TOOL_NAME = None
+                    # Remember every tools/list result so names and info can be served without a round trip
+                    if is_tools_list:
+                        TOOLS_CACHE["tools"] = data['result']['tools']
+                        TOOLS_CACHE["ts"] = time.monotonic()
+                    
+                    # Hand the result to the callback registered for this request ID, if any
+                    with PENDING_LOCK:
+                        on_result = PENDING.pop(data.get('id'), None) if isinstance(data, dict) else None
+                    if on_result is not None and isinstance(result, dict):
+                        on_result(result)
                     else:
-                        print(f"\n[EVENT RECEIVED]:\n{json.dumps(data, indent=2)}")
+                        print(f"\n[EVENT RECEIVED]:\n{pretty_json(data)}")
                         
                 except json.JSONDecodeError:
                     print(f"\n[RAW EVENT RECEIVED]:\n{event_data}")
@@ -72,33 +129,36 @@ def sse_listener():
         print(f"Error connecting to SSE stream: {e}")
         STOP_EVENT.set()
     finally:
+        # Wake the main thread if it is still waiting for a session that will never come
+        SESSION_READY.set()
         print("SSE listener stopped.")
 
 # --- Command Sender Function ---
-def send_command(method: str, params: dict):
-    """Sends a JSON-RPC command via HTTP POST and returns the request ID."""
+def send_command(method: str, params: dict, on_result=None):
+    """Sends a JSON-RPC command via HTTP POST and returns the request ID.
+
+    If on_result is given, it is called with the response's result when it arrives on the SSE stream.
+    """
     global REQUEST_ID
     if not SESSION_ID:
         print("Error: No session ID available. Make sure the SSE listener is running.")
         return None
 
-    payload = {
-        "jsonrpc": "2.0",
-        "id": REQUEST_ID,
-        "method": method,
-        "params": params,
-    }
+    body = encode_request(method, params, REQUEST_ID)
+    # Register before posting: the response can arrive on the SSE stream before the POST returns
+    if on_result is not None:
+        with PENDING_LOCK:
+            PENDING[REQUEST_ID] = on_result
 
     try:
-        response = requests.post(
-            f"{MESSAGES_URL}?sessionId={SESSION_ID}",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
+        # The session already sends Content-Type: application/json
+        response = HTTP.post(f"{MESSAGES_URL}?sessionId={SESSION_ID}", data=body)
         response.raise_for_status()
         print(f"Command '{method}' sent successfully. Server response: {response.text}")
     except requests.exceptions.RequestException as e:
         print(f"Error sending command: {e}")
+        with PENDING_LOCK:
+            PENDING.pop(REQUEST_ID, None)
     
     current_request_id = REQUEST_ID
     REQUEST_ID += 1
@@ -107,18 +167,22 @@ def send_command(method: str, params: dict):
 # --- New Functionality: List and Show Tool Info ---
 def list_tool_names():
     """Lists only the names of available tools."""
-    global EXPECTING_TOOL_NAMES
+    tools = cached_tools()
+    if tools is not None:
+        print_tool_names(tools)
+        return
     print("Requesting tool names...")
-    EXPECTING_TOOL_NAMES = True  # Set flag to expect tool names
-    send_command("tools/list", {})
+    send_command("tools/list", {}, on_result=lambda result: print_tool_names(result.get('tools', [])))
 
 def show_tool_info(tool_name: str):
     """Shows detailed information for a specific tool by filtering the tools/list response."""
-    global EXPECTING_TOOL_INFO, REQUESTED_TOOL_NAME
+    tools = cached_tools()
+    if tools is not None:
+        print_tool_info(tools, tool_name)
+        return
     print(f"Requesting info for tool: {tool_name}")
-    EXPECTING_TOOL_INFO = True  # Set flag to expect tool info for filtering
-    REQUESTED_TOOL_NAME = tool_name  # Store the requested tool name
-    send_command("tools/list", {})  # Call tools/list and filter the response
+    # Call tools/list and filter the response when it arrives
+    send_command("tools/list", {}, on_result=lambda result: print_tool_info(result.get('tools', []), tool_name))
 
 # --- Main Application Logic ---
 if __name__ == "__main__":
@@ -126,8 +190,7 @@ if __name__ == "__main__":
     listener_thread.daemon = True
     listener_thread.start()
 
-    while not SESSION_ID and not STOP_EVENT.is_set():
-        time.sleep(1)
+    SESSION_READY.wait(timeout=SESSION_TIMEOUT)
 
     if not SESSION_ID:
         print("Failed to establish session. Exiting.")